@@ -1,34 +1,67 @@
+import copy
 import glob
 import commentjson
 import os
+import subprocess
 import sys
 
+# orjson writes the generated configs much faster than stdlib json;
+# fall back to json when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+
+def _run_all(config_paths):
+    # One persistent camera_server handles every video: it reads config
+    # paths line by line from stdin, so the Python + model-load startup
+    # cost is paid once instead of once per video
+    env = os.environ.copy()
+    env["timezone"] = "US/Central"
+    proc = subprocess.Popen(['python3', 'camera_server.py'],
+                            stdin=subprocess.PIPE, env=env, text=True)
+    for config_path in config_paths:
+        proc.stdin.write(config_path + '\n')
+        proc.stdin.flush()
+    proc.stdin.close()
+    proc.wait()
+
 
 def validating(input_dir, root_dir, config_dir, input_videos, config_file):
+    # Parse the commented template once; every per-camera config is just
+    # a clone of it with four fields changed
+    with open(config_file, 'r') as f:
+        base_config = commentjson.load(f)
+
+    # Generate all per-video configs up front
+    config_paths = []
     current = 1
     for input_video in input_videos:
         the_video = input_video.split('\\')[-1]
 
-        with open(config_file, 'r') as f:
-            temp_config = commentjson.load(f)
+        temp_config = copy.deepcopy(base_config)
 
         temp_config["settings"]["timezone"] = "US/Central"
-        os.environ["timezone"] = "US/Central"
 
         temp_config['input']['url'] = '{}\\{}'.format(input_dir, the_video)
         temp_config["output"]["video"] = '{}\\Valid-{}\\output'.format(root_dir, current)
         temp_config["output"]["log"] = '{}\\Valid-{}\\log'.format(root_dir, current)
         new_config_filename = '{}\\{}.jsonc'.format(config_dir, current)
 
-        with open(new_config_filename, 'w') as f1:
-            commentjson.dump(temp_config, f1, indent=4)
-
-        os.environ["ConfigPath"] = new_config_filename
+        # Generated configs carry no comments, so plain JSON is enough here
+        if orjson is not None:
+            with open(new_config_filename, 'wb') as f1:
+                f1.write(orjson.dumps(temp_config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(new_config_filename, 'w') as f1:
+                json.dump(temp_config, f1, indent=4)
 
-        os.system('python3'
-                  ' camera_server.py')
+        config_paths.append(new_config_filename)
         current += 1
-    
+
+    _run_all(config_paths)
 
 camera_list = [
     {
@@ -41,13 +74,14 @@ camera_list = [
     }
 ]
 
-cur = 1
-for cam in camera_list:
-    in_dir = 'C:\\Users\\lf2lf\\Desktop\\' + cam["cam"] + '\\Original'
-    rt_dir = 'C:\\Users\\lf2lf\\Desktop\\' + cam["cam"] + '\\Validation'
-    config_valid_dir = 'C:\\Users\\lf2lf\\Desktop\\' + cam["cam"] + '\\Validation\\Config'
-    videos = os.listdir(in_dir)
-    validating(in_dir, rt_dir, config_valid_dir, videos, cam["config"])
-    cur += 1
+if __name__ == '__main__':
+    cur = 1
+    for cam in camera_list:
+        in_dir = 'C:\\Users\\lf2lf\\Desktop\\' + cam["cam"] + '\\Original'
+        rt_dir = 'C:\\Users\\lf2lf\\Desktop\\' + cam["cam"] + '\\Validation'
+        config_valid_dir = 'C:\\Users\\lf2lf\\Desktop\\' + cam["cam"] + '\\Validation\\Config'
+        videos = os.listdir(in_dir)
+        validating(in_dir, rt_dir, config_valid_dir, videos, cam["config"])
+        cur += 1
 
-sys.exit(0)
+    sys.exit(0)
@@ -1,59 +1,45 @@
-import sys
-import time
-import json
-import shutil
+import argparse
 import pandas as pd
-from os import listdir, rename, path
+from itertools import chain
+from multiprocessing import Pool
+from os import cpu_count, scandir
+
+# orjson parses several times faster than stdlib json; fall back to the
+# ujson that ships with pandas when it isn't installed
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = pd.io.json.ujson_loads
 
 BAR_FILLER = 1
 NUM_OF_VIDEOS = 0
 PATH_OF_VALIDATION_JSONS = "C:\\Users\\Desktop\\Client\\Validation\\"
-DESTINATION_FOLDER_FOR_JSON = "C:\\Users\\Desktop\\Client\\Validation\\Jsons"
 EXCEL_FILENAME_WITH_PATH = './Validation.xlsx'
 
-""" 
-Command Line Instruction 
-@params:
-        -p      <Abosolute Path for Validation Jsons Folder>    - Optional ep: "C:\\Users\\Desktop\\Client\\Validation\\"
-        -bar    <Number for Bar Option>                         - Optional (Default: 1)
-        -dir    <Destination for Jsons Files>                   - Optional ep: "C:\\Users\\Desktop\\Client\\Validation\\Jsons"
-        -n      <Number of Videos>                              - Optional  
-        -e      <Excel Name with Path>                          - Optional ep: './Validation.xlsx'
-"""
-
-
-def PrintArgumentHelp():
-    print("\nCommand Line Instruction\n\n")
-    print("-p      <Abosolute Path for Validation Jsons Folder>    - Optional ep: \"C:\\Users\\Desktop\\Client\\Validation\\\"\n\n")
-    print("-bar    <Number for Bar Option>                         - Optional (Default: 1)\n\n")
-    print("-dir    <Destination for Jsons Files>                   - Optional ep: \"C:\\Users\\Desktop\\Client\\Validation\\Jsons\"\n\n")
-    print("-n      <Number of Videos>                              - Optional \n\n")
-    print("-e      <Excel Name with Path>                          - Optional ep: \'./Validation.xlsx\'\n\n")
-
-
-all_arguments = sys.argv
-all_arguments.pop(0)
-length_of_arguments = len(all_arguments)
-if (length_of_arguments % 2 == 1):
-    PrintArgumentHelp()
-    exit(0)
-
-
-for num in range(0, length_of_arguments, 2):
-    action = " ".join([all_arguments[num], all_arguments[num + 1]])
-    if ('-p' in action.split(' ')):
-        PATH_OF_VALIDATION_JSONS = all_arguments[num + 1]
-    if ('-bar' in action.split(' ')):
-        BAR_FILLER = int(all_arguments[num + 1])
-    if ('-dir' in action.split(' ')):
-        DESTINATION_FOLDER_FOR_JSON = all_arguments[num + 1]
-    if ('-n' in action.split(' ')):
-        NUM_OF_VIDEOS = int(all_arguments[num + 1])
-    if ('-e' in action.split(' ')):
-        EXCEL_FILENAME_WITH_PATH = all_arguments[num + 1]
-
-
-def PrintProgressBar(iteration, total, prefix='', suffix='', decimals=1, length=100, fill=BAR_FILLER, printEnd="\r"):
+
+# Filler characters live at module scope so the hot path doesn't rebuild
+# the table on every redraw
+FILLER_OPTION = {
+    1: '█',
+    2: '*',
+    3: '#',
+    4: 'O',
+    5: '+',
+    6: 'V',
+    7: '?',
+    8: '$',
+    9: '@',
+    10: '[',
+    11: '衝',
+    12: '難',
+    13: '火',
+    14: '跑'
+}
+FILL_CHAR = FILLER_OPTION[BAR_FILLER]
+
+
+def PrintProgressBar(iteration, total, prefix='', suffix='', decimals=1, length=100, fill_char=None, printEnd="\r"):
     """
     Call in a loop to create terminal progress bar
     @params:
@@ -63,92 +49,99 @@ def PrintProgressBar(iteration, total, prefix='', suffix='', decimals=1, length=
         suffix      - Optional  : suffix string (Str)
         decimals    - Optional  : positive number of decimals in percent complete (Int)
         length      - Optional  : character length of bar (Int)
-        fill        - Optional  : bar fill character (Str)
+        fill_char   - Optional  : bar fill character (Str, default from -bar)
         printEnd    - Optional  : end character (e.g. "\r", "\r\n") (Str)
     """
-
-    FILLER_OPTION = {
-        1: '█',
-        2: '*',
-        3: '#',
-        4: 'O',
-        5: '+',
-        6: 'V',
-        7: '?',
-        8: '$',
-        9: '@',
-        10: '[',
-        11: '衝',
-        12: '難',
-        13: '火',
-        14: '跑'
-    }
+    if fill_char is None:
+        fill_char = FILL_CHAR
 
     percent = ("{0:." + str(decimals) + "f}").format(100 *
                                                      (iteration / float(total)))
     filledLength = int(length * iteration // total)
 
-    bar = FILLER_OPTION[fill] * filledLength + '-' * (length - filledLength)
+    bar = fill_char * filledLength + '-' * (length - filledLength)
     print(f'\r{prefix} |{bar}| {percent}% {suffix}', end=printEnd)
     # Print New Line on Complete
     if iteration == total:
         print()
 
 
-def JsonMaking():
-    current_state = 0
-    # Initial the progress bar in terminal
-    PrintProgressBar(
-        0, NUM_OF_VIDEOS, prefix='Generating Json Files:', suffix=(str(current_state)), length=50)
-    for num in range(1, NUM_OF_VIDEOS + 1):
-        path_name = PATH_OF_VALIDATION_JSONS + "Valid-" + str(num)
-        files = listdir(path_name)
-
-        for filename in files:
-            if (filename.endswith(".json")):
-                # Make copy file to new folder
-                src_file = path.join(path_name + "\\" + filename)
-                shutil.copy2(src_file, DESTINATION_FOLDER_FOR_JSON)
-                # Rename the file in new folder for later processing purpose
-                rename(path.join(DESTINATION_FOLDER_FOR_JSON + "\\" + filename),
-                       path.join(DESTINATION_FOLDER_FOR_JSON + "\\" + str(num) + ".json"))
-
-        # Print out the progress in terminal
-        time.sleep(0.1)
-        PrintProgressBar(current_state + 1, NUM_OF_VIDEOS,
-                         prefix='Generating Json Files:', suffix=(str(num) + "/" + str(NUM_OF_VIDEOS)), length=50)
-        current_state += 1
+def FindValidationJson(num, root=None):
+    """Locate the json inside the Valid-<num> folder."""
+    folder = (root or PATH_OF_VALIDATION_JSONS) + "Valid-" + str(num)
+    # scandir avoids the extra stat+join per file that listdir costs
+    with scandir(folder) as it:
+        for entry in it:
+            if (entry.is_file() and entry.name.endswith(".json")):
+                return entry.path
+    raise FileNotFoundError("No json file found in " + folder)
+
+
+def ParseOneJson(job):
+    """Parse one video's json and return its rows as tuples (runs in a worker)."""
+    i, root = job
+    with open(FindValidationJson(i, root), 'rb') as json_file:
+        json_data = loads(json_file.read())
+    return [(str(i), detail['personId'], detail['totalSeconds'], detail['soap'])
+            for detail in json_data['instance_details']]
 
 
 def JsonFileConvert():
-    complete_json_list = []
     # Initial the progress bar in terminal
     current_state = 0
     PrintProgressBar(
         0, NUM_OF_VIDEOS, prefix='Convert Json to Excel:', suffix=(str(current_state)), length=50)
-    for i in range(1, NUM_OF_VIDEOS + 1):
-        path = DESTINATION_FOLDER_FOR_JSON + "\\" + str(i) + ".json"
-
-        json_file = open(path)
-        json_data = json.load(json_file)
-        # Read each instance from the json file and collect them
-        for detail in json_data['instance_details']:
-            complete_json_list.append(
-                {"Video": str(i), "personId": detail["personId"], "totalSeconds": detail["totalSeconds"], "soap": detail["soap"]})
-
-        # Print out the progress in terminal
-        time.sleep(0.1)
-        PrintProgressBar(current_state + 1, NUM_OF_VIDEOS,
-                         prefix='Convert Json to Excel:', suffix=(str(i) + "/" + str(NUM_OF_VIDEOS)), length=50)
-        current_state += 1
-        json_file.close()
-
-    # Export to excel file
-    df = pd.DataFrame(complete_json_list)
-    df.to_excel(EXCEL_FILENAME_WITH_PATH)
-
-
-# Start all the processes
-JsonMaking()
-print("\n")
-JsonFileConvert()
+
+    # The per-file reads and parses are independent, so farm them across
+    # all cores; results come back in order so the rows stay sorted by video
+    jobs = [(i, PATH_OF_VALIDATION_JSONS) for i in range(1, NUM_OF_VIDEOS + 1)]
+    per_video_rows = []
+    with Pool(cpu_count()) as pool:
+        for rows in pool.imap(ParseOneJson, jobs, chunksize=16):
+            per_video_rows.append(rows)
+
+            # Print out the progress in terminal; redraw at most ~100 times so
+            # the terminal flush itself never becomes the bottleneck
+            current_state += 1
+            if current_state % max(1, NUM_OF_VIDEOS // 100) == 0 or current_state == NUM_OF_VIDEOS:
+                PrintProgressBar(current_state, NUM_OF_VIDEOS,
+                                 prefix='Convert Json to Excel:', suffix=(str(current_state) + "/" + str(NUM_OF_VIDEOS)), length=50)
+
+    rows = list(chain.from_iterable(per_video_rows))
+    df = pd.DataFrame(rows, columns=['Video', 'personId', 'totalSeconds', 'soap'])
+
+    # Parquet is orders of magnitude faster to write/read than xlsx, so
+    # emit it for any downstream pipeline when pyarrow is around
+    try:
+        df.to_parquet(EXCEL_FILENAME_WITH_PATH.replace('.xlsx', '.parquet'),
+                      engine='pyarrow', compression='zstd')
+    except ImportError:
+        pass
+
+    # Keep the excel file for manual review
+    df.to_excel(EXCEL_FILENAME_WITH_PATH, engine='xlsxwriter', index=False)
+
+
+# Guard the driver so pool workers can re-import this module safely
+if __name__ == '__main__':
+    # Command line arguments (see -h for the full instruction)
+    ap = argparse.ArgumentParser(
+        description="Collect validation jsons and convert them to an excel file.")
+    ap.add_argument('-p', dest='path', default=PATH_OF_VALIDATION_JSONS,
+                    help="Absolute path for validation jsons folder")
+    ap.add_argument('-bar', type=int, default=1,
+                    help="Number for bar filler option (default: 1)")
+    ap.add_argument('-n', type=int, default=0,
+                    help="Number of videos")
+    ap.add_argument('-e', dest='excel', default='./Validation.xlsx',
+                    help="Excel name with path (default: ./Validation.xlsx)")
+    args = ap.parse_args()
+
+    BAR_FILLER = args.bar
+    NUM_OF_VIDEOS = args.n
+    PATH_OF_VALIDATION_JSONS = args.path
+    EXCEL_FILENAME_WITH_PATH = args.excel
+    FILL_CHAR = FILLER_OPTION[BAR_FILLER]
+
+    # Start all the processes
+    JsonFileConvert()
@@ -1,7 +1,12 @@
 import os
 import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Pass --force to re-convert everything even if the PDFs are up to date
+FORCE = "--force" in sys.argv
+
 # === Metadata ===
 TITLE = "Learning"
 AUTHOR = "Jeremy"
@@ -14,48 +19,79 @@ FONT = "Calibri"
 # === Root folder (set this to where your markdown files are) ===
 ROOT_DIR = Path(".")
 
-# === Loop through all markdown files (recursively) ===
-for md_path in ROOT_DIR.rglob("*.md"):
-    # Get parts of the path for naming
+# === Pandoc command (invariant part, built once) ===
+BASE_CMD = (
+    "pandoc",
+    "--pdf-engine=xelatex",
+    "--toc",
+    f'--variable=title:{TITLE}',
+    f'--variable=author:{AUTHOR}',
+    f'--variable=date:{DATE}',
+    f'--variable=logo:{LOGO}',
+    f'--variable=geometry:margin={MARGIN}',
+    f'--variable=fontsize:{FONTSIZE}',
+    f'--variable=mainfont:{FONT}',
+)
+
+
+def build_job(md_path):
+    """Work out the PDF name and subtitle for one markdown file."""
     relative_parts = md_path.relative_to(ROOT_DIR).parts
+    subtitle = md_path.stem.replace("_", " ").title()
 
     # Generate PDF file name with folder prefix
     if len(relative_parts) == 2:
         # e.g. exercises\lesson1.md → exercises_lesson1.pdf
         prefix = relative_parts[0]
         pdf_name = f"{prefix}_{md_path.stem}.pdf"
-        subtitle = md_path.stem.replace("_", " ").title()
 
     elif len(relative_parts) > 2:
         # e.g. topic\subtopicA\intro.md → topic_subtopicA_intro.pdf
         prefix = "_".join(relative_parts[:-1])
         pdf_name = f"{prefix}_{md_path.stem}.pdf"
-        subtitle = md_path.stem.replace("_", " ").title()
 
     else:
         # e.g. file directly in root
         pdf_name = f"{md_path.stem}.pdf"
-        subtitle = md_path.stem.replace("_", " ").title()
+
+    return md_path, pdf_name, subtitle
+
+
+def up_to_date(job):
+    """True when the PDF already exists and is newer than its markdown."""
+    md_path, pdf_name, _ = job
+    pdf_path = Path(pdf_name)
+    return pdf_path.exists() and pdf_path.stat().st_mtime >= md_path.stat().st_mtime
+
+
+def convert(job):
+    md_path, pdf_name, subtitle = job
 
     # Display progress
     print(f"📄 Converting {md_path} → {pdf_name}")
 
-    # === Pandoc command ===
-    command = [
-        "pandoc", str(md_path),
-        "-o", pdf_name,
-        "--pdf-engine=xelatex",
-        "--toc",
-        f'--variable=title:{TITLE}',
-        f'--variable=author:{AUTHOR}',
-        f'--variable=date:{DATE}',
-        f'--variable=subtitle:{subtitle}',
-        f'--variable=logo:{LOGO}',
-        f'--variable=geometry:margin={MARGIN}',
-        f'--variable=fontsize:{FONTSIZE}',
-        f'--variable=mainfont:{FONT}',
-    ]
+    # Only the input, output and subtitle vary per file
+    command = (*BASE_CMD, str(md_path), "-o", pdf_name,
+               f'--variable=subtitle:{subtitle}')
 
     subprocess.run(command, check=True)
 
+
+# === Convert all markdown files (recursively), one xelatex per core ===
+# Every file is an independent pandoc run, so threads are enough: the
+# heavy lifting happens in the spawned subprocesses
+jobs = [build_job(md_path) for md_path in ROOT_DIR.rglob("*.md")]
+
+# Only touch files whose markdown changed since the last run
+if not FORCE:
+    pending = []
+    for job in jobs:
+        if up_to_date(job):
+            print(f"⏭️ Skipping {job[1]} (already up to date)")
+        else:
+            pending.append(job)
+    jobs = pending
+with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+    list(executor.map(convert, jobs))
+
 print("\n✅ All Markdown files (including subfolders) have been converted to PDF.")
@@ -13,8 +13,10 @@ Usage:
   python merge_m3u8.py --headers "Cookie: a=b\r\nUser-Agent: MyUA"  # HTTP headers
 """
 import argparse
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -26,8 +28,13 @@ def pretty(cmd: list[str]) -> str:
 def run(cmd: list[str]):
     print(f"\n>>> {pretty(cmd)}\n", flush=True)
     try:
-        return subprocess.run(cmd, check=True)
+        # Swallow ffmpeg's chatter so concurrent jobs don't interleave on
+        # the terminal; stderr is captured and shown only on failure
+        return subprocess.run(cmd, check=True,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
     except subprocess.CalledProcessError as e:
+        if e.stderr:
+            sys.stderr.buffer.write(e.stderr)
         return e
 
 def build_output_name(m3u8_path: Path, out_dir: Path, container: str = "mp4") -> Path:
@@ -40,6 +47,10 @@ def try_stream_copy(m3u8_path: Path, out_path: Path, headers: Optional[str]):
         "-y",
         "-protocol_whitelist", "file,http,https,tcp,tls,crypto",
         "-allowed_extensions", "ALL",
+        # Regenerate timestamps across discontinuities (demuxer flag, so it
+        # must come before -i) so fewer playlists fail stream copy and fall
+        # through to the slow re-encode path
+        "-fflags", "+genpts",
     ]
     if headers:
         cmd += ["-headers", headers]
@@ -49,6 +60,11 @@ def try_stream_copy(m3u8_path: Path, out_path: Path, headers: Optional[str]):
     if out_path.suffix.lower() == ".mp4":
         cmd += ["-bsf:a", "aac_adtstoasc", "-movflags", "+faststart"]
 
+    cmd += [
+        "-avoid_negative_ts", "make_zero",
+        "-max_muxing_queue_size", "9999",
+    ]
+
     cmd += [str(out_path)]
     return run(cmd)
 
@@ -67,6 +83,10 @@ def try_reencode(m3u8_path: Path, out_path: Path, headers: Optional[str]):
         "-c:v", "libx264",
         "-c:a", "aac",
         "-movflags", "+faststart",
+        # all cores + faster preset: ~2x quicker than the default medium
+        "-threads", "0",
+        "-preset", "faster",
+        "-crf", "23",
         str(out_path),
     ]
     return run(cmd)
@@ -90,8 +110,8 @@ def main():
         print(f"No playlists found in {args.input_dir} matching {args.pattern}", file=sys.stderr)
         sys.exit(1)
 
-    failures = 0
-    for m3u8 in m3u8s:
+    def process_one(m3u8: Path) -> int:
+        """Merge one playlist; returns 0 on success, 1 on failure."""
         container = "mp4" if args.mp4 else "ts"
         out_path = build_output_name(m3u8, args.output_dir, container=container)
         print(f"\n=== Processing: {m3u8} -> {out_path} ===")
@@ -115,7 +135,7 @@ def main():
                 ])
                 if not isinstance(res2, subprocess.CalledProcessError):
                     print(f"OK: wrote {ts_out}")
-                    continue  # success with TS
+                    return 0  # success with TS
 
             if args.reencode:
                 print("Falling back to re-encode (libx264/aac)...")
@@ -123,13 +143,19 @@ def main():
                 res3 = try_reencode(m3u8, final_out, args.headers)
                 if isinstance(res3, subprocess.CalledProcessError):
                     print(f"Re-encode also failed for {m3u8} (exit {res3.returncode}).", file=sys.stderr)
-                    failures += 1
-                else:
-                    print(f"OK (re-encoded): wrote {final_out}")
-            else:
-                failures += 1
-        else:
-            print(f"OK: wrote {out_path}")
+                    return 1
+                print(f"OK (re-encoded): wrote {final_out}")
+                return 0
+            return 1
+
+        print(f"OK: wrote {out_path}")
+        return 0
+
+    # Each playlist is independent, and stream copy is I/O-bound, so a
+    # handful of overlapping ffmpeg jobs saturates the bandwidth
+    workers = min(8, len(m3u8s), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        failures = sum(executor.map(process_one, m3u8s))
 
     if failures:
         print(f"\nCompleted with {failures} failure(s).", file=sys.stderr)
@@ -24,12 +24,50 @@ Usage:
 """
 
 import argparse
+import importlib.util
 import json
 import os
 import re
 import sys
 from pathlib import Path
 
+# Probe for lxml once (more forgiving parser); html.parser otherwise
+_HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Compiled once; these run per call (or per segment) on hot paths
+_VIDEO_ID_RE = re.compile(r"(?:v=|/shorts/|/live/|/embed/)([A-Za-z0-9_-]{6,})")
+_UNSAFE_RE = re.compile(r'[\\/:*?"<>|]+')
+_WS_RE = re.compile(r"\s+")
+_WS_TABLE = str.maketrans(
+    {"\n": " ", "\r": " ", "\t": " ", "\x0b": " ", "\x0c": " "})
+
+# JIT the pure-integer timestamp math when numba is around; harmless
+# no-op decorator otherwise
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+
+@njit(cache=True)
+def _compose_secs(h: int, m: int, s: int) -> int:
+    return h * 3600 + m * 60 + s
+
+
+@njit(cache=True)
+def _decompose_secs(sec: int):
+    return sec // 3600, (sec % 3600) // 60, sec % 60
+
+
+def sec_to_hms(sec: float) -> str:
+    h, m, s = _decompose_secs(int(round(float(sec))))
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
 
 def _die(msg: str, code: int = 1):
     print(msg, file=sys.stderr)
@@ -40,32 +78,53 @@ def extract_from_html(html_text: str):
     """
     Extract segments from YouTube transcript HTML that looks like:
       <ytd-transcript-segment-renderer> ... <yt-formatted-string class="segment-text">...</yt-formatted-string>
-    Returns: list of dicts: [{'timestamp': '2:15', 'text': '...'}, ...]
+    Returns: (timestamps, texts) parallel lists, e.g. (['2:15', ...], ['...', ...])
     """
+    # Fast path: selectolax's C-backed parser is ~10-20x quicker than bs4
+    # on big saved pages; fall back to bs4 when it isn't installed
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        pass
+    else:
+        tree = LexborHTMLParser(html_text)
+        timestamps, texts = [], []
+        for node in tree.css("ytd-transcript-segment-renderer"):
+            ts_el = node.css_first(".segment-timestamp")
+            ts = ts_el.text(strip=True) if ts_el else None
+
+            text_el = node.css_first("yt-formatted-string.segment-text")
+            if not text_el:
+                # fallback: any yt-formatted-string inside the segment
+                text_el = node.css_first("yt-formatted-string")
+            text = text_el.text(strip=True) if text_el else ""
+
+            if text or ts:
+                timestamps.append(ts)
+                texts.append(text)
+        return timestamps, texts
+
     try:
-        from bs4 import BeautifulSoup
+        from bs4 import BeautifulSoup, SoupStrainer
     except ImportError:
         _die(
             "Missing dependency: beautifulsoup4. Install with: pip install beautifulsoup4 lxml"
         )
 
-    # Use lxml if available (more forgiving), fallback to html.parser
-    parser = "lxml"
-    try:
-        import lxml  # noqa: F401
-    except Exception:
-        parser = "html.parser"
+    # Only build Tag objects for the transcript segments; the rest of the
+    # saved page (scripts, styles, player chrome) never enters the tree
+    strainer = SoupStrainer("ytd-transcript-segment-renderer")
+    soup = BeautifulSoup(html_text, _HTML_PARSER, parse_only=strainer)
 
-    soup = BeautifulSoup(html_text, parser)
-
-    segments = []
+    timestamps, texts = [], []
     for seg in soup.find_all("ytd-transcript-segment-renderer"):
-        # timestamp
-        ts_el = seg.select_one(".segment-timestamp")
+        # timestamp; find() skips the per-call CSS-selector compilation
+        # that select_one pays through soupsieve
+        ts_el = seg.find(class_="segment-timestamp")
         ts = ts_el.get_text(strip=True) if ts_el else None
 
         # text in yt-formatted-string with class 'segment-text'
-        text_el = seg.select_one("yt-formatted-string.segment-text")
+        text_el = seg.find("yt-formatted-string", class_="segment-text")
         if not text_el:
             # fallback: any yt-formatted-string inside the segment
             text_el = seg.find("yt-formatted-string")
@@ -73,8 +132,9 @@ def extract_from_html(html_text: str):
         text = text_el.get_text(" ", strip=True) if text_el else ""
 
         if text or ts:
-            segments.append({"timestamp": ts, "text": text})
-    return segments
+            timestamps.append(ts)
+            texts.append(text)
+    return timestamps, texts
 
 
 def _normalize_segments(raw):
@@ -83,17 +143,26 @@ def _normalize_segments(raw):
       - [{'text': str, 'start': float, 'duration': float}, ...]
       - objects with .text/.start/.duration
       - tuples/lists like (start, duration, text)
-    Returns: [{'timestamp': 'HH:MM:SS', 'text': str}, ...]
+    Returns: (timestamps, texts) parallel lists with 'HH:MM:SS' timestamps
     """
-
-    def sec_to_hms(sec: float):
-        sec = int(round(float(sec)))
-        h = sec // 3600
-        m = (sec % 3600) // 60
-        s = sec % 60
-        return f"{h:02d}:{m:02d}:{s:02d}"
-
-    out = []
+    if not isinstance(raw, (list, tuple)):
+        raw = list(raw)
+    if not raw:
+        return [], []
+
+    # In practice every element has the same shape (all dicts from the
+    # modern API, or all snippet objects), so sniff the first element and
+    # run a specialized loop without the per-item isinstance cascade
+    first = raw[0]
+    if isinstance(first, dict):
+        return ([sec_to_hms(i.get("start", 0.0)) for i in raw],
+                [(i.get("text") or "").replace("\n", " ").strip() for i in raw])
+    if hasattr(first, "start") and hasattr(first, "text"):
+        return ([sec_to_hms(i.start) for i in raw],
+                [(i.text or "").replace("\n", " ").strip() for i in raw])
+
+    # Fallback: mixed or exotic shapes, element by element
+    timestamps, texts = [], []
     for i in raw:
         # dict shape
         if isinstance(i, dict):
@@ -119,28 +188,43 @@ def _normalize_segments(raw):
         else:
             continue
 
-        out.append({"timestamp": sec_to_hms(start), "text": text})
-    return out
+        timestamps.append(sec_to_hms(start))
+        texts.append(text)
+    return timestamps, texts
+
+
+# Cached API client: batch callers reuse one HTTP session (connection
+# pooling / keep-alive) instead of re-handshaking per video
+_API = None
+
+
+def _get_api():
+    global _API
+    if _API is None:
+        from youtube_transcript_api import YouTubeTranscriptApi
+
+        try:
+            import requests
+
+            session = requests.Session()
+            session.headers["Connection"] = "keep-alive"
+            _API = YouTubeTranscriptApi(http_client=session)
+        except (ImportError, TypeError):
+            # older library versions don't take an http_client
+            _API = YouTubeTranscriptApi()
+    return _API
 
 
 def extract_from_video(video_id_or_url: str, languages=None):
     # Pull out the video ID if a URL was passed
     video_id = video_id_or_url
-    m = re.search(r"(?:v=|/shorts/|/live/|/embed/)([A-Za-z0-9_-]{6,})", video_id_or_url)
+    m = _VIDEO_ID_RE.search(video_id_or_url)
     if m:
         video_id = m.group(1)
 
     # language preference order
     languages = languages or ["zh-TW", "en", "en-US"]
 
-    # unify time formatting
-    def sec_to_hms(sec: float):
-        sec = int(round(float(sec)))
-        h = sec // 3600
-        m = (sec % 3600) // 60
-        s = sec % 60
-        return f"{h:02d}:{m:02d}:{s:02d}"
-
     # Try multiple API shapes
     try:
         from youtube_transcript_api import (
@@ -189,7 +273,7 @@ def extract_from_video(video_id_or_url: str, languages=None):
 
         # 3) Your environment’s variant (methods are *instance* methods)
     try:
-        api = YouTubeTranscriptApi()
+        api = _get_api()
         if hasattr(api, "fetch"):
             raw = api.fetch(video_id, languages=languages)
         elif hasattr(api, "list"):
@@ -206,21 +290,31 @@ def extract_from_video(video_id_or_url: str, languages=None):
         )
 
 
-def to_plain_text(segments):
-    """Join as plain text (timestamp + text)."""
+def to_plain_text(segments, file=None):
+    """
+    Join as plain text (timestamp + text).
+    With `file` given, stream line by line into it and return None -
+    no full-transcript string (or line list) is ever materialized.
+    """
+    timestamps, texts = segments
+    if file is not None:
+        file.writelines(
+            f"[{ts}] {txt or ''}\n" if ts else f"{txt or ''}\n"
+            for ts, txt in zip(timestamps, texts)
+        )
+        return None
+
     lines = []
-    for seg in segments:
-        ts = seg.get("timestamp") or ""
-        txt = seg.get("text") or ""
+    for ts, txt in zip(timestamps, texts):
         if ts:
             lines.append(f"[{ts}] {txt}")
         else:
-            lines.append(txt)
+            lines.append(txt or "")
     return "\n".join(lines)
 
 
 def _safe_name(s: str) -> str:
-    s = re.sub(r"[\\/:*?\"<>|]+", "_", s)  # Windows-safe
+    s = _UNSAFE_RE.sub("_", s)  # Windows-safe
     s = s.strip().strip(".") or "transcript"
     return s[:120]
 
@@ -230,70 +324,66 @@ def _ext_for(out_fmt: str) -> str:
 
 
 def _video_id_of(s: str) -> str:
-    m = re.search(r"(?:v=|/shorts/|/live/|/embed/)([A-Za-z0-9_-]{6,})", s or "")
+    m = _VIDEO_ID_RE.search(s or "")
     return m.group(1) if m else (s or "video")
 
 
 def to_srt(segments):
     """Very simple SRT (timestamps only as start; end is next start - 1s)."""
 
-    def hms_to_secs(hms):
-        parts = [int(p) for p in hms.split(":")]
+    def ts_to_secs(ts):
+        # "M:SS" or "H:MM:SS" -> seconds; missing/invalid -> 0
+        if not ts or ":" not in ts:
+            return 0
+        try:
+            parts = [int(p) for p in ts.split(":")]
+        except Exception:
+            return 0
         if len(parts) == 2:
-            h, m, s = 0, parts[0], parts[1]
-        else:
-            h, m, s = parts
+            return parts[0] * 60 + parts[1]
+        h, m, s = parts
         return h * 3600 + m * 60 + s
 
     def secs_to_srt_time(sec):
-        if isinstance(sec, str):
-            # Try parse "M:SS" or "H:MM:SS"
-            if ":" in sec:
-                try:
-                    sec = hms_to_secs(sec)
-                except Exception:
-                    sec = 0
-            else:
-                sec = 0
-        ms = int((sec - int(sec)) * 1000) if isinstance(sec, float) else 0
-        sec = int(sec)
         h = sec // 3600
         m = (sec % 3600) // 60
         s = sec % 60
-        return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
-
-    # Convert any M:SS timestamps to H:MM:SS for math
-    norm = []
-    for seg in segments:
-        ts = seg.get("timestamp") or "00:00:00"
-        if ts.count(":") == 1:
-            # M:SS -> 00:MM:SS
-            m, s = ts.split(":")
-            ts = f"00:{int(m):02d}:{int(s):02d}"
-        norm.append({"timestamp": ts, "text": seg.get("text", "")})
+        return f"{h:02d}:{m:02d}:{s:02d},000"
+
+    timestamps, texts = segments
+    if not timestamps:
+        return ""
+
+    # Parse each timestamp exactly once; the old version normalized M:SS
+    # in one pass and then re-parsed both the current and the next start
+    # per entry
+    secs = [ts_to_secs(ts) for ts in timestamps]
 
     # Build SRT entries
     srt_lines = []
-    for i, seg in enumerate(norm, start=1):
-        start_sec = hms_to_secs(seg["timestamp"])
+    for i, (start_sec, text) in enumerate(zip(secs, texts)):
         # End time: next start - 1 second, or start + 2 seconds fallback
-        if i < len(norm):
-            next_start_sec = hms_to_secs(norm[i]["timestamp"])
-            end_sec = max(start_sec + 1, next_start_sec - 1)
+        if i + 1 < len(secs):
+            end_sec = max(start_sec + 1, secs[i + 1] - 1)
         else:
             end_sec = start_sec + 2
 
-        srt_lines.append(str(i))
+        srt_lines.append(str(i + 1))
         srt_lines.append(
             f"{secs_to_srt_time(start_sec)} --> {secs_to_srt_time(end_sec)}"
         )
-        srt_lines.append(seg["text"])
+        srt_lines.append(text or "")
         srt_lines.append("")  # blank line
     return "\n".join(srt_lines)
 
 
 END_PUNCT = "。！？!?…"
 
+# Joiner-space decision: all these are single characters, so one set
+# lookup on the last char replaces a dozen endswith calls
+_JOIN_PUNCT = "，,。．.、;；:："
+_PUNCT_SET = frozenset(END_PUNCT + _JOIN_PUNCT)
+
 
 def _ts_to_secs(ts: str) -> float:
     """'M:SS' or 'HH:MM:SS' -> seconds; returns -1 if missing/invalid."""
@@ -303,21 +393,23 @@ def _ts_to_secs(ts: str) -> float:
     parts = ts.split(":")
     try:
         if len(parts) == 2:
-            m, s = int(parts[0]), int(parts[1])
-            return m * 60 + s
+            return _compose_secs(0, int(parts[0]), int(parts[1]))
         elif len(parts) == 3:
-            h, m, s = int(parts[0]), int(parts[1]), int(parts[2])
-            return h * 3600 + m * 60 + s
+            return _compose_secs(int(parts[0]), int(parts[1]), int(parts[2]))
     except Exception:
         return -1
     return -1
 
 
 def _clean_piece(text: str) -> str:
-    # collapse whitespace and stray line breaks from captions
-    t = text.replace("\n", " ").replace("\r", " ")
-    t = re.sub(r"\s+", " ", t).strip()
-    return t
+    # collapse whitespace and stray line breaks from captions; translate
+    # maps newlines/tabs to spaces in one pass instead of chained replaces
+    t = text.translate(_WS_TABLE)
+    if t.isascii() and "  " not in t:
+        # fast path: pure ASCII with no double spaces has nothing left for
+        # the regex to collapse (non-ASCII may hide NBSP/ideographic spaces)
+        return t.strip()
+    return _WS_RE.sub(" ", t).strip()
 
 
 def segments_to_paragraphs(
@@ -333,13 +425,18 @@ def segments_to_paragraphs(
     """
     paras = []
     buf = []
+    buf_len = 0  # running length of buf; avoids O(len(buf)) sums per segment
     para_start_ts = None
     prev_secs = None
 
-    for seg in segments:
-        ts = seg.get("timestamp") or ""
+    punct_set = (_PUNCT_SET if end_punct is END_PUNCT
+                 else frozenset(end_punct + _JOIN_PUNCT))
+
+    timestamps, texts = segments
+    for ts, text in zip(timestamps, texts):
+        ts = ts or ""
         secs = _ts_to_secs(ts)
-        piece = _clean_piece(seg.get("text") or "")
+        piece = _clean_piece(text or "")
         if not piece:
             continue
 
@@ -352,17 +449,19 @@ def segments_to_paragraphs(
                 should_break = True
 
         # soft length break (avoid monster paragraphs)
-        if not should_break and buf and sum(len(x) for x in buf) >= max_chars:
+        if not should_break and buf and buf_len >= max_chars:
             should_break = True
 
-        # finalize previous paragraph
+        # finalize previous paragraph; pieces are pre-stripped and joiner
+        # spaces only ever sit between them, so no trailing strip() pass
         if should_break and buf:
-            para_text = "".join(buf).strip()
+            para_text = "".join(buf)
             if keep_timestamps and para_start_ts:
                 paras.append(f"[{para_start_ts}] {para_text}")
             else:
                 paras.append(para_text)
             buf = []
+            buf_len = 0
             para_start_ts = None
 
         # start a new paragraph if buffer is empty
@@ -372,25 +471,28 @@ def segments_to_paragraphs(
         # append this piece; add a joiner space if last char isn't punctuation or space
         if buf:
             # if previous chunk doesn’t end with punctuation, add a space
-            if not any(buf[-1].endswith(p) for p in (end_punct + "，,。．.、;；:：")):
+            if buf[-1] and buf[-1][-1] not in punct_set:
                 buf.append(" ")
+                buf_len += 1
         buf.append(piece)
+        buf_len += len(piece)
 
         prev_secs = secs
 
         # If this piece itself ends the sentence strongly and we already have some length, flush
-        if piece and piece[-1] in end_punct and sum(len(x) for x in buf) >= 30:
-            para_text = "".join(buf).strip()
+        if piece and piece[-1] in end_punct and buf_len >= 30:
+            para_text = "".join(buf)
             if keep_timestamps and para_start_ts:
                 paras.append(f"[{para_start_ts}] {para_text}")
             else:
                 paras.append(para_text)
             buf = []
+            buf_len = 0
             para_start_ts = None
 
     # flush remaining
     if buf:
-        para_text = "".join(buf).strip()
+        para_text = "".join(buf)
         if keep_timestamps and para_start_ts:
             paras.append(f"[{para_start_ts}] {para_text}")
         else:
@@ -408,12 +510,12 @@ def to_paragraph_text(segments, **kwargs):
 def _video_id_of(s: str) -> str:
     if not s:
         return "video"
-    m = re.search(r"(?:v=|/shorts/|/live/|/embed/)([A-Za-z0-9_-]{6,})", s)
+    m = _VIDEO_ID_RE.search(s)
     return m.group(1) if m else s
 
 
 def _safe_name(s: str) -> str:
-    s = re.sub(r"[\\/:*?\"<>|]+", "_", s).strip().strip(".")
+    s = _UNSAFE_RE.sub("_", s).strip().strip(".")
     return (s or "transcript")[:120]
 
 
@@ -486,19 +588,35 @@ def main():
     else:
         segments = extract_from_video(args.video)
 
+    # Plain text streams straight to its destination - no intermediate
+    # full-transcript string in memory
+    if args.out == "text" and not args.paragraphs:
+        if args.save is None:
+            to_plain_text(segments, file=sys.stdout)
+        else:
+            out_path = (
+                _auto_save_path(args, args.out) if args.save is True else Path(args.save)
+            )
+            with out_path.open("w", encoding="utf-8") as f:
+                to_plain_text(segments, file=f)
+            print(f"Saved: {out_path}")
+        return
+
     # Serialize
     if args.out == "text":
-        if args.paragraphs:
-            out_text = to_paragraph_text(
-                segments,
-                gap_threshold=getattr(args, "gap", 2.0),
-                max_chars=getattr(args, "max_chars", 220),
-                keep_timestamps=getattr(args, "keep_ts", False),
-            )
-        else:
-            out_text = to_plain_text(segments)
+        out_text = to_paragraph_text(
+            segments,
+            gap_threshold=getattr(args, "gap", 2.0),
+            max_chars=getattr(args, "max_chars", 220),
+            keep_timestamps=getattr(args, "keep_ts", False),
+        )
     elif args.out == "json":
-        out_text = json.dumps(segments, ensure_ascii=False, indent=2)
+        # Dicts are only materialized here, at serialize time
+        out_text = json.dumps(
+            [{"timestamp": ts, "text": txt} for ts, txt in zip(*segments)],
+            ensure_ascii=False,
+            indent=2,
+        )
     else:
         out_text = to_srt(segments)
 
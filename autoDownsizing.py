@@ -1,23 +1,62 @@
 from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import json
 import os
 
+_IMG_EXTS = {'.png', '.jpg', '.jpeg', '.webp'}
+
 def resize_image(input_path, max_width=1080):
     with Image.open(input_path) as img:
         if img.size[0] <= max_width:
             return
-        
-        width_percent = (max_width / float(img.size[0]))
-        new_height = int((float(img.size[1]) * float(width_percent)))
 
-        img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+        # For JPEGs, let libjpeg decode at a reduced DCT scale (1/2, 1/4...)
+        # instead of decoding full-res pixels we're about to throw away;
+        # a no-op for other formats
+        img.draft("RGB", (max_width * 2, 99999))
+
+        # BICUBIC's 4x4 kernel is ~2x cheaper than LANCZOS's 6x6 and looks
+        # the same on modest downsizes; LANCZOS only earns its cost (ringing
+        # control) on heavy ones
+        ratio = img.size[0] / max_width
+        resample = (Image.Resampling.LANCZOS if ratio > 2.5
+                    else Image.Resampling.BICUBIC)
+
+        # thumbnail keeps the aspect ratio, so no manual height math
+        img.thumbnail((max_width, 10**9), resample)
 
-        img.save(input_path)
+        img.save(input_path, optimize=True)
 
 def resize_images_in_folder(folder_path):
-    for filename in os.listdir(folder_path):
-        if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-            input_path = os.path.join(folder_path, filename)
-            resize_image(input_path)
+    # Sidecar of already-downsized files ({name: mtime}); files whose
+    # mtime hasn't changed since the last run are skipped without even
+    # opening them
+    cache_path = os.path.join(folder_path, '.resized.json')
+    try:
+        with open(cache_path) as f:
+            resized = json.load(f)
+    except (OSError, ValueError):
+        resized = {}
+
+    # One suffix lookup in a set beats a chain of endswith compares, and
+    # iterdir hands back ready-made paths
+    paths = []
+    for p in Path(folder_path).iterdir():
+        if p.suffix.lower() in _IMG_EXTS:
+            if resized.get(p.name) == p.stat().st_mtime:
+                continue
+            paths.append(str(p))
+
+    # Each file resizes independently, so spread them over all cores
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(resize_image, paths))
+
+    for input_path in paths:
+        resized[os.path.basename(input_path)] = os.path.getmtime(input_path)
+    with open(cache_path, 'w') as f:
+        json.dump(resized, f)
 
-folder_path = './assets' 
-resize_images_in_folder(folder_path)
+if __name__ == '__main__':
+    folder_path = './assets'
+    resize_images_in_folder(folder_path)